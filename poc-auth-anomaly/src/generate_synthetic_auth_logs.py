@@ -13,140 +13,285 @@ Notes:
 from __future__ import annotations
 
 import argparse
-import csv
 import ipaddress
-import random
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
 
 
 @dataclass(frozen=True)
 class UserProfile:
     username: str
     home_country: str
-    usual_hours: Tuple[int, int]  # inclusive start hour, inclusive end hour
+    usual_hours: Tuple[int, int] | None  # inclusive start hour, inclusive end hour; None = no preference
     success_rate: float
-    known_ip_blocks: List[str]  # CIDR blocks
+    known_ip_ranges: List[Tuple[int, int]]  # (first, last) host addresses per CIDR block
+
+
+# Some common “reasons” and “auth types” to make logs feel realistic
+AUTH_TYPES = [("password", 0.75), ("ssh_key", 0.18), ("mfa_push", 0.07)]
+EVENT_SOURCES = [("linux-sshd", 0.45), ("windows-ad", 0.35), ("vpn-gateway", 0.20)]
+
+
+def _cum_table(items: List[Tuple[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Split (value, weight) pairs into values and cumulative weights for weighted_picks."""
+    values, weights = zip(*items)
+    return np.array(values), np.cumsum(weights)
+
+
+# Cumulative weights are computed once so each pick is a bisect, not a rescan
+AUTH_VALUES, AUTH_CUM = _cum_table(AUTH_TYPES)
+SRC_VALUES, SRC_CUM = _cum_table(EVENT_SOURCES)
+
+COUNTRIES = ["US", "CA", "GB", "DE", "FR", "AU", "JP"]
+FAILURE_REASONS = ["bad_password", "mfa_denied", "user_not_found", "expired_password"]
+
+# Normal rows are generated in fixed-size chunks, each with its own child seed,
+# so the output for a given --seed does not depend on the worker count
+CHUNK_ROWS = 100_000
+
+# Output buffer size; the default 8 KiB turns multi-MB outputs into thousands of write() calls
+WRITE_BUFFER_BYTES = 1 << 20
+
+FIELDNAMES = [
+    "timestamp_utc",
+    "username",
+    "event_source",
+    "auth_type",
+    "source_ip",
+    "country",
+    "result",
+    "failure_reason",
+    "is_injected_anomaly",
+]
 
 
-def weighted_choice(rng: random.Random, items: List[Tuple[str, float]]) -> str:
-    total = sum(w for _, w in items)
-    r = rng.random() * total
-    upto = 0.0
-    for item, weight in items:
-        upto += weight
-        if upto >= r:
-            return item
-    return items[-1][0]
+def weighted_picks(rng: np.random.Generator, values: np.ndarray, cum_weights: np.ndarray, n: int) -> np.ndarray:
+    """Batched weighted choice: one searchsorted over the cumulative weights for all n draws."""
+    picked: np.ndarray = values[np.searchsorted(cum_weights, rng.random(n) * cum_weights[-1], side="right")]
+    return picked
 
 
-def random_ip_from_cidr(rng: random.Random, cidr: str) -> str:
+@lru_cache(maxsize=64)
+def _cidr_range(cidr: str) -> Tuple[int, int]:
     net = ipaddress.ip_network(cidr, strict=False)
     # avoid network/broadcast for IPv4 where applicable
     if isinstance(net, ipaddress.IPv4Network) and net.num_addresses > 2:
-        first = int(net.network_address) + 1
-        last = int(net.broadcast_address) - 1
-    else:
-        first = int(net.network_address)
-        last = int(net.network_address) + net.num_addresses - 1
-    return str(ipaddress.ip_address(rng.randint(first, last)))
+        return int(net.network_address) + 1, int(net.broadcast_address) - 1
+    return int(net.network_address), int(net.network_address) + net.num_addresses - 1
 
 
-def random_timestamp(rng: random.Random, start: datetime, end: datetime, prefer_hours: Tuple[int, int] | None) -> datetime:
-    total_seconds = int((end - start).total_seconds())
-    base = start + timedelta(seconds=rng.randint(0, total_seconds))
+def _ip_ranges(*cidrs: str) -> List[Tuple[int, int]]:
+    return [_cidr_range(c) for c in cidrs]
+
 
-    if prefer_hours is None:
-        return base
+def _format_ipv4(x: int) -> str:
+    return f"{(x >> 24) & 0xFF}.{(x >> 16) & 0xFF}.{(x >> 8) & 0xFF}.{x & 0xFF}"
 
-    h_start, h_end = prefer_hours
-    # 80% of the time, force hour into the preferred window
-    if rng.random() < 0.8:
-        hour = rng.randint(h_start, h_end)
-        minute = rng.randint(0, 59)
-        second = rng.randint(0, 59)
-        return base.replace(hour=hour, minute=minute, second=second)
-    return base
+
+def random_ip_from_cidr(rng: np.random.Generator, cidr: str) -> str:
+    first, last = _cidr_range(cidr)
+    return _format_ipv4(int(rng.integers(first, last, endpoint=True)))
 
 
 def build_user_profiles() -> List[UserProfile]:
     return [
-        UserProfile("alice", "US", (8, 17), 0.97, ["10.10.10.0/24", "192.168.10.0/24"]),
-        UserProfile("bob", "US", (7, 16), 0.96, ["10.10.20.0/24", "192.168.20.0/24"]),
-        UserProfile("carol", "CA", (9, 18), 0.98, ["10.10.30.0/24", "192.168.30.0/24"]),
-        UserProfile("dave", "GB", (6, 15), 0.95, ["10.10.40.0/24", "192.168.40.0/24"]),
-        UserProfile("svc_backup", "US", (0, 23), 0.995, ["10.99.0.0/24"]),  # service acct (always-on)
+        UserProfile("alice", "US", (8, 17), 0.97, _ip_ranges("10.10.10.0/24", "192.168.10.0/24")),
+        UserProfile("bob", "US", (7, 16), 0.96, _ip_ranges("10.10.20.0/24", "192.168.20.0/24")),
+        UserProfile("carol", "CA", (9, 18), 0.98, _ip_ranges("10.10.30.0/24", "192.168.30.0/24")),
+        UserProfile("dave", "GB", (6, 15), 0.95, _ip_ranges("10.10.40.0/24", "192.168.40.0/24")),
+        UserProfile("svc_backup", "US", None, 0.995, _ip_ranges("10.99.0.0/24")),  # service acct (always-on)
     ]
 
 
+@dataclass(frozen=True)
+class UserTable:
+    """
+    Per-user attributes as parallel arrays, indexed by user position.
+
+    Built once from the profiles so row generation only does fancy indexing.
+    """
+    usernames: np.ndarray
+    home_country: np.ndarray
+    hour_lo: np.ndarray
+    hour_hi: np.ndarray
+    prefer: np.ndarray  # False where usual_hours is None
+    success_rate: np.ndarray
+    # All users' IP blocks as one flat (first, last) table; a user's blocks start at block_offset
+    n_blocks: np.ndarray
+    block_offset: np.ndarray
+    ip_ranges: np.ndarray
+
+
+def build_user_table(users: List[UserProfile]) -> UserTable:
+    n_blocks = np.array([len(u.known_ip_ranges) for u in users])
+    return UserTable(
+        usernames=np.array([u.username for u in users]),
+        home_country=np.array([u.home_country for u in users]),
+        hour_lo=np.array([u.usual_hours[0] if u.usual_hours else 0 for u in users]),
+        hour_hi=np.array([u.usual_hours[1] if u.usual_hours else 23 for u in users]),
+        prefer=np.array([u.usual_hours is not None for u in users]),
+        success_rate=np.array([u.success_rate for u in users]),
+        n_blocks=n_blocks,
+        block_offset=np.cumsum(n_blocks) - n_blocks,
+        ip_ranges=np.array([r for u in users for r in u.known_ip_ranges], dtype=np.uint32),
+    )
+
+
+def format_timestamps(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Format epoch seconds as ISO-8601 UTC strings, matching isoformat(timespec="seconds")."""
+    iso = np.datetime_as_string(epoch_seconds.astype("datetime64[s]"), unit="s")
+    return np.char.add(iso, "+00:00")
+
+
+def format_ip_addresses(ips: np.ndarray) -> np.ndarray:
+    """Format uint32 IPv4 addresses as dotted-quad strings."""
+    out = ((ips >> 24) & 0xFF).astype(str)
+    for shift in (16, 8, 0):
+        out = np.char.add(np.char.add(out, "."), ((ips >> shift) & 0xFF).astype(str))
+    return out
+
+
 def generate_normal_events(
-    rng: random.Random,
-    users: List[UserProfile],
+    rng: np.random.Generator,
+    table: UserTable,
     start: datetime,
     end: datetime,
     n: int,
-) -> List[Dict[str, str]]:
-    results: List[Dict[str, str]] = []
-
-    # Some common “reasons” and “auth types” to make logs feel realistic
-    auth_types = [("password", 0.75), ("ssh_key", 0.18), ("mfa_push", 0.07)]
-    event_sources = [("linux-sshd", 0.45), ("windows-ad", 0.35), ("vpn-gateway", 0.20)]
-    user_agents = [
-        ("OpenSSH_8.9", 0.35),
-        ("Windows10", 0.30),
-        ("macOS", 0.15),
-        ("curl/7.81", 0.05),
-        ("unknown", 0.15),
-    ]
-
-    for _ in range(n):
-        u = rng.choice(users)
-        ts = random_timestamp(rng, start, end, u.usual_hours if u.username != "svc_backup" else None)
-        src = weighted_choice(rng, event_sources)
-        auth = weighted_choice(rng, auth_types)
-        ua = weighted_choice(rng, user_agents)
-
-        source_ip = random_ip_from_cidr(rng, rng.choice(u.known_ip_blocks))
-
-        country = u.home_country if rng.random() < 0.92 else rng.choice(["US", "CA", "GB", "DE", "FR", "AU", "JP"])
-      
-        success = rng.random() < u.success_rate
-        result = "SUCCESS" if success else "FAILURE"
+) -> Dict[str, np.ndarray]:
+    """
+    Generate n baseline events as a dict of column arrays (one entry per CSV field).
+    """
+    user_idx = rng.integers(0, len(table.usernames), size=n)
+
+    # Timestamps as epoch seconds: draw both the uniform base and the
+    # preferred-window variant (same UTC day), then keep the variant 80% of the time
+    start_epoch = int(start.timestamp())
+    total_seconds = int((end - start).total_seconds())
+    base_ts = start_epoch + rng.integers(0, total_seconds, size=n, endpoint=True)
+    hour = rng.integers(table.hour_lo[user_idx], table.hour_hi[user_idx], endpoint=True)
+    pref_ts = base_ts // 86400 * 86400 + hour * 3600 + rng.integers(0, 3600, size=n)
+    ts = np.where(table.prefer[user_idx] & (rng.random(n) < 0.8), pref_ts, base_ts)
+
+    srcs = weighted_picks(rng, SRC_VALUES, SRC_CUM, n)
+    auths = weighted_picks(rng, AUTH_VALUES, AUTH_CUM, n)
+
+    block = table.block_offset[user_idx] + rng.integers(0, table.n_blocks[user_idx])
+    ips = rng.integers(table.ip_ranges[block, 0], table.ip_ranges[block, 1], endpoint=True, dtype=np.uint32)
+
+    # Only the ~8% of rows away from home need a random country drawn
+    # widen first so a roaming code longer than the home codes is not truncated
+    country = table.home_country[user_idx].astype(np.result_type(table.home_country, np.array(COUNTRIES)))
+    roamed = np.flatnonzero(rng.random(n) >= 0.92)
+    country[roamed] = rng.choice(COUNTRIES, size=roamed.size)
+
+    # Likewise, failure reasons are drawn for failing rows only
+    success = rng.random(n) < table.success_rate[user_idx]
+    failed = np.flatnonzero(~success)
+    failure_reason = np.full(n, "", dtype=f"<U{max(map(len, FAILURE_REASONS))}")
+    failure_reason[failed] = rng.choice(FAILURE_REASONS, size=failed.size)
+
+    return {
+        "timestamp_utc": format_timestamps(ts),
+        "username": table.usernames[user_idx],
+        "event_source": srcs,
+        "auth_type": auths,
+        "source_ip": format_ip_addresses(ips),
+        "country": country,
+        "result": np.where(success, "SUCCESS", "FAILURE"),
+        "failure_reason": failure_reason,
+        "is_injected_anomaly": np.full(n, "false"),
+    }
+
+
+def chunk_sizes(n: int) -> List[int]:
+    """Split n normal rows into CHUNK_ROWS-sized chunks (always at least one)."""
+    return [min(CHUNK_ROWS, n - i) for i in range(0, n, CHUNK_ROWS)] or [0]
+
+
+def render_chunk(
+    rng: np.random.Generator,
+    table: UserTable,
+    start: datetime,
+    end: datetime,
+    n: int,
+    anomalies: Dict[str, np.ndarray],
+    at: np.ndarray,
+) -> bytes:
+    """Generate one chunk of normal rows, insert its anomalies before rows `at`, and encode it as CSV."""
+    chunk = generate_normal_events(rng, table, start, end, n)
+    if len(at):
+        chunk = {f: _insert(chunk[f], at, anomalies[f]) for f in FIELDNAMES}
+    return format_csv_lines(columns_to_rows(chunk)).encode("utf-8")
+
+
+def generate_csv_chunks(
+    seed: np.random.SeedSequence,
+    table: UserTable,
+    start: datetime,
+    end: datetime,
+    placed: List[Tuple[Dict[str, np.ndarray], np.ndarray]],
+    sizes: List[int],
+    workers: int,
+) -> Iterator[bytes]:
+    """
+    Render the CSV body chunk by chunk, fanned out over worker processes.
+
+    Each chunk is generated, merged with its anomalies and serialized in the
+    worker, so the parent only writes bytes. Chunks are yielded in order.
+    Falls back to in-process rendering when there is only one chunk or one worker.
+    """
+    rngs = [np.random.default_rng(s) for s in seed.spawn(len(sizes))]
+    args = zip(rngs, repeat(table), repeat(start), repeat(end), sizes, *zip(*placed))
+
+    if workers > 1 and len(sizes) > 1:
+        workers = min(workers, len(sizes))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            # Keep at most two chunks per worker in flight so finished chunks
+            # cannot pile up in the parent when the writer falls behind
+            pending: deque[Future[bytes]] = deque()
+            for chunk_args in args:
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+                pending.append(ex.submit(render_chunk, *chunk_args))
+            while pending:
+                yield pending.popleft().result()
+    else:
+        for chunk_args in args:
+            yield render_chunk(*chunk_args)
 
-        results.append(
-            {
-                "timestamp_utc": ts.astimezone(timezone.utc).isoformat(timespec="seconds"),
-                "username": u.username,
-                "event_source": src,
-                "auth_type": auth,
-                "source_ip": source_ip,
-                "country": country,
-                "result": result,
-                "failure_reason": "" if success else rng.choice(["bad_password", "mfa_denied", "user_not_found", "expired_password"]),
-            }
-        )
 
-    return results
+def columns_to_rows(columns: Dict[str, np.ndarray]) -> Iterator[Tuple[str, ...]]:
+    """Zip column arrays into row tuples in FIELDNAMES order."""
+    # .tolist() once per column avoids boxing a numpy scalar per cell
+    return zip(*(columns[k].tolist() for k in FIELDNAMES))
 
 
-def inject_anomalies(
-    rng: random.Random,
-    events: List[Dict[str, str]],
+def build_anomalies(
+    rng: np.random.Generator,
     start: datetime,
     end: datetime,
-) -> List[Dict[str, str]]:
-    """Add a small number of clearly suspicious patterns."""
-    anomalies: List[Dict[str, str]] = []
+) -> Dict[str, np.ndarray]:
+    """Build a small number of clearly suspicious patterns as columns, in random order."""
+    anomalies: List[Dict[str, str | int]] = []
+    # Timestamps are kept as epoch seconds and formatted in one pass at the end
+    start_sec = int(start.timestamp())
 
     # 1) Impossible travel: same user, close timestamps, far countries
     for user in ["alice", "bob"]:
-        t1 = start + timedelta(hours=rng.randint(10, 40))
-        t2 = t1 + timedelta(minutes=rng.randint(5, 35))
+        t1 = start_sec + int(rng.integers(10, 40, endpoint=True)) * 3600
+        t2 = t1 + int(rng.integers(5, 35, endpoint=True)) * 60
         anomalies.append(
             {
-                "timestamp_utc": t1.astimezone(timezone.utc).isoformat(timespec="seconds"),
+                "timestamp_utc": t1,
                 "username": user,
                 "event_source": "vpn-gateway",
                 "auth_type": "password",
@@ -158,7 +303,7 @@ def inject_anomalies(
         )
         anomalies.append(
             {
-                "timestamp_utc": t2.astimezone(timezone.utc).isoformat(timespec="seconds"),
+                "timestamp_utc": t2,
                 "username": user,
                 "event_source": "vpn-gateway",
                 "auth_type": "password",
@@ -171,12 +316,12 @@ def inject_anomalies(
 
     # 2) Brute-force then success
     victim = "carol"
-    base = start + timedelta(hours=rng.randint(60, 90))
+    base = start_sec + int(rng.integers(60, 90, endpoint=True)) * 3600
     brute_ip = random_ip_from_cidr(rng, "45.33.0.0/16")  # public-ish looking
     for i in range(12):
         anomalies.append(
             {
-                "timestamp_utc": (base + timedelta(minutes=i)).astimezone(timezone.utc).isoformat(timespec="seconds"),
+                "timestamp_utc": base + i * 60,
                 "username": victim if rng.random() < 0.7 else rng.choice(["alice", "bob", "dave", "unknown_user"]),
                 "event_source": "linux-sshd",
                 "auth_type": "password",
@@ -188,7 +333,7 @@ def inject_anomalies(
         )
     anomalies.append(
         {
-            "timestamp_utc": (base + timedelta(minutes=13)).astimezone(timezone.utc).isoformat(timespec="seconds"),
+            "timestamp_utc": base + 13 * 60,
             "username": victim,
             "event_source": "linux-sshd",
             "auth_type": "password",
@@ -200,10 +345,10 @@ def inject_anomalies(
     )
 
     # 3) Off-hours admin-ish behavior
-    t = start + timedelta(days=2, hours=3, minutes=rng.randint(0, 59))
+    t = start_sec + 2 * 86400 + 3 * 3600 + int(rng.integers(0, 59, endpoint=True)) * 60
     anomalies.append(
         {
-            "timestamp_utc": t.astimezone(timezone.utc).isoformat(timespec="seconds"),
+            "timestamp_utc": t,
             "username": "dave",
             "event_source": "windows-ad",
             "auth_type": "mfa_push",
@@ -215,10 +360,10 @@ def inject_anomalies(
     )
 
     # 4) Service account from a new IP block (rare source)
-    t = start + timedelta(days=1, hours=12, minutes=rng.randint(0, 59))
+    t = start_sec + 86400 + 12 * 3600 + int(rng.integers(0, 59, endpoint=True)) * 60
     anomalies.append(
         {
-            "timestamp_utc": t.astimezone(timezone.utc).isoformat(timespec="seconds"),
+            "timestamp_utc": t,
             "username": "svc_backup",
             "event_source": "linux-sshd",
             "auth_type": "ssh_key",
@@ -232,34 +377,67 @@ def inject_anomalies(
     # Tag the injected anomalies
     for a in anomalies:
         a["is_injected_anomaly"] = "true"
-    for e in events:
-        e["is_injected_anomaly"] = "false"
 
-    combined = events + anomalies
-    rng.shuffle(combined)
-    return combined
+    perm = rng.permutation(len(anomalies))
+    columns = {k: np.array([a[k] for a in anomalies])[perm] for k in FIELDNAMES}
+    columns["timestamp_utc"] = format_timestamps(columns["timestamp_utc"])
+    return columns
 
 
-def write_csv(path: Path, rows: List[Dict[str, str]]) -> None:
+def inject_anomalies(
+    rng: np.random.Generator,
+    sizes: List[int],
+    anomalies: Dict[str, np.ndarray],
+) -> List[Tuple[Dict[str, np.ndarray], np.ndarray]]:
+    """
+    Choose random positions for the anomalies among the normal rows, split by chunk.
+
+    Normal rows are i.i.d., so their generation order is already random; placing
+    the shuffled anomalies at uniformly random slots gives the same distribution
+    as shuffling the combined rows, without materializing them.
+
+    Returns, per chunk, the anomaly columns it receives and the chunk-local row
+    offsets to insert them before.
+    """
+    n = sum(sizes)
+    k = len(anomalies["username"])
+    slots = np.sort(rng.choice(n + k, size=k, replace=False))
+    # Number of normal rows that come before each anomaly
+    before = slots - np.arange(k)
+
+    placed = []
+    lo = 0
+    for i, size in enumerate(sizes):
+        hi = lo + size
+        # the last chunk also takes anomalies that land after every normal row
+        take = (before >= lo) & ((before < hi) | (i == len(sizes) - 1))
+        placed.append(({f: anomalies[f][take] for f in FIELDNAMES}, before[take] - lo))
+        lo = hi
+    return placed
+
+
+def _insert(column: np.ndarray, at: np.ndarray, values: np.ndarray) -> np.ndarray:
+    # widen the string dtype first; np.insert would silently truncate longer values
+    return np.insert(column.astype(np.result_type(column, values)), at, values)
+
+
+def format_csv_lines(rows: Iterable[Tuple[str, ...]]) -> str:
+    """
+    Serialize rows as CSV text with CRLF line endings, like csv.writer's default.
+
+    Fields are never quoted: every value is a fixed vocabulary word, an IP or a
+    timestamp, none of which contain commas, quotes or newlines.
+    """
+    return "".join([",".join(row) + "\r\n" for row in rows])
+
+
+def write_csv(path: Path, chunks: Iterable[bytes]) -> None:
+    """Write the CSV header followed by already-encoded body chunks, in order."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = [
-        "timestamp_utc",
-        "username",
-        "event_source",
-        "auth_type",
-        "source_ip",
-        "country",
-        "result",
-        "failure_reason",
-        "is_injected_anomaly",
-    ]
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            for k in fieldnames:
-                r.setdefault(k, "")
-            w.writerow({k: r.get(k, "") for k in fieldnames})
+    with path.open("wb", buffering=WRITE_BUFFER_BYTES) as f:
+        f.write(format_csv_lines([tuple(FIELDNAMES)]).encode("utf-8"))
+        for chunk in chunks:
+            f.write(chunk)
 
 
 def parse_args() -> argparse.Namespace:
@@ -267,30 +445,42 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--rows", type=int, default=1200, help="Number of normal log rows to generate (default: 1200)")
     p.add_argument("--days", type=int, default=7, help="Time window in days (default: 7)")
     p.add_argument("--seed", type=int, default=1337, help="RNG seed for reproducible output (default: 1337)")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=f"Worker processes for normal rows; only used above {CHUNK_ROWS} rows (default: CPU count)",
+    )
     p.add_argument(
         "--out",
         type=str,
         default=str(Path("poc-auth-anomaly") / "data" / "sample_auth_logs.csv"),
         help="Output CSV path",
     )
-    return p.parse_args()
+    args = p.parse_args()
+    if args.rows < 0:
+        p.error("--rows must be >= 0")
+    return args
 
 
 def main() -> int:
     args = parse_args()
-    rng = random.Random(args.seed)
+    # Independent child streams for normal rows and anomalies, both derived from --seed
+    normal_seed, anomaly_seed = np.random.SeedSequence(args.seed).spawn(2)
+    rng = np.random.default_rng(anomaly_seed)
 
     end = datetime.now(timezone.utc)
     start = end - timedelta(days=args.days)
 
-    users = build_user_profiles()
-    normal = generate_normal_events(rng, users, start, end, args.rows)
-    combined = inject_anomalies(rng, normal, start, end)
+    table = build_user_table(build_user_profiles())
+    anomalies = build_anomalies(rng, start, end)
+    sizes = chunk_sizes(args.rows)
+    placed = inject_anomalies(rng, sizes, anomalies)
 
     out_path = Path(args.out)
-    write_csv(out_path, combined)
+    write_csv(out_path, generate_csv_chunks(normal_seed, table, start, end, placed, sizes, args.workers))
 
-    print(f"✅ Wrote {len(combined)} rows to: {out_path.as_posix()}")
+    print(f"✅ Wrote {args.rows + len(anomalies['username'])} rows to: {out_path.as_posix()}")
     print("   (Includes injected anomalies tagged with is_injected_anomaly=true)")
     return 0
 